@@ -13,5 +13,6 @@ class GenericIO(object):
         new = self.copy()
         for col in self.columns.drop('atom'):
             if self[col].dtype == np.dtype('O'):
-                new._frame.loc[:, col] = self[col].apply(formatter)
+                new._frame = new._frame.assign(
+                    **{col: self[col].apply(formatter)})
         return new
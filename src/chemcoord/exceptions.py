@@ -44,6 +44,8 @@ class InvalidReference(UndefinedCoordinateSystem):
     * ``zmat_after_assignment``: Attached information if
       it was raised from the safe assignment methods
       (:meth:`Zmat.safe_loc` and :meth:`Zmat.unsafe_loc`).
+    * ``conformer`` and ``already_built_conformers``: Attached information
+      if it was raised from :meth:`Zmat.get_cartesian_batch`.
     """
     def __init__(self, message=None, i=None, b=None, a=None, d=None,
                  already_built_cartesian=None,
@@ -64,7 +66,10 @@ class InvalidReference(UndefinedCoordinateSystem):
         if self.message is None:
             give_message = ('Atom {i} uses an invalid/linear reference '
                             'spanned by: {r}'.format)
-            return give_message(i=self.index, r=self.references)
+            message = give_message(i=self.index, r=self.references)
+            if hasattr(self, 'conformer'):
+                message += ' in conformer {}'.format(self.conformer)
+            return message
         else:
             return repr(self.message)
 
@@ -1,8 +1,36 @@
 # -*- coding: utf-8 -*-
+import pandas as pd
 
 from chemcoord.exceptions import InvalidReference
 
 
+_structure_cols = frozenset({'atom', 'b', 'a', 'd'})
+
+
+def _assign(molecule, indexer_name, key, value):
+    """Assign ``value`` to ``key`` and invalidate the structure key
+    of ``molecule``, if the index or ``['atom', 'b', 'a', 'd']``
+    might have changed.
+    """
+    molecule._own_frame()
+    index = molecule._frame.index
+    indexer = getattr(molecule._frame, indexer_name)
+    if isinstance(key, tuple):
+        indexer[key[0], key[1]] = value
+        columns = getattr(molecule._frame.columns.to_series(),
+                          indexer_name)[key[1]]
+        if isinstance(columns, pd.Series):
+            columns = set(columns)
+        else:
+            columns = {columns}
+        if (not _structure_cols.isdisjoint(columns)
+                or molecule._frame.index is not index):
+            molecule._invalidate_struct_key()
+    else:
+        indexer[key] = value
+        molecule._invalidate_struct_key()
+
+
 class _generic_Indexer(object):
     def __init__(self, molecule):
         self.molecule = molecule
@@ -24,11 +52,7 @@ class _ILoc(_generic_Indexer):
 
 class _Unsafe_base():
     def __setitem__(self, key, value):
-        indexer = getattr(self.molecule._frame, self.indexer)
-        if isinstance(key, tuple):
-            indexer[key[0], key[1]] = value
-        else:
-            indexer[key] = value
+        _assign(self.molecule, self.indexer, key, value)
 
 class _SafeBase():
     def __setitem__(self, key, value):
@@ -42,12 +66,7 @@ class _SafeBase():
             molecule = self.molecule
         else:
             molecule = self.molecule.copy()
-        indexer = getattr(molecule._frame, self.indexer)
-
-        if isinstance(key, tuple):
-            indexer[key[0], key[1]] = value
-        else:
-            indexer[key] = value
+        _assign(molecule, self.indexer, key, value)
 
         try:
             molecule.get_cartesian()
@@ -79,6 +98,8 @@ class _SafeBase():
             rotated = ref.align(new, mass_weight=True)[1]
             c_table = self.molecule.loc[:, ['b', 'a', 'd']]
             self.molecule._frame = rotated.get_zmat(c_table)._frame
+            self.molecule._owned = True
+            self.molecule._invalidate_struct_key()
 
 
 
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
-import copy
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import chemcoord.constants as constants
@@ -35,7 +35,8 @@ class ZmatCore(PandasWrapper, GenericCore):
     test_operators = True
     pure_internal_mov = False
 
-    def __init__(self, frame, metadata=None, _metadata=None):
+    def __init__(self, frame, metadata=None, _metadata=None,
+                 _assume_owned=False):
         """How to initialize a Zmat instance.
 
         Args:
@@ -46,6 +47,9 @@ class ZmatCore(PandasWrapper, GenericCore):
             order_of_definition (list like): Specify in which order
                 the Zmatrix is defined. If ``None`` it just uses
                 ``self.index``.
+            _assume_owned (bool): Internal flag. If True, ``frame`` is
+                not copied, because the caller guarantees that nobody
+                else modifies it.
 
         Returns:
             Zmat: A new zmat instance.
@@ -53,16 +57,22 @@ class ZmatCore(PandasWrapper, GenericCore):
         if not self._required_cols <= set(frame.columns):
             raise PhysicalMeaning('There are columns missing for a '
                                   'meaningful description of a molecule')
-        self._frame = frame.copy()
+        self._frame = frame if _assume_owned else frame.copy()
+        self._owned = True
+        self._invalidate_struct_key()
         if metadata is None:
             self.metadata = {}
         else:
             self.metadata = metadata.copy()
 
+        # The values of _metadata are shared between copies and
+        # are never modified inplace.
+        # ``has_dummies`` is copied on write and
+        # ``last_valid_cartesian`` is only reassigned.
         if _metadata is None:
             self._metadata = {}
         else:
-            self._metadata = copy.deepcopy(_metadata)
+            self._metadata = dict(_metadata)
 
         def fill_missing_keys_with_defaults(_metadata):
             if 'last_valid_cartesian' not in _metadata:
@@ -75,8 +85,32 @@ class ZmatCore(PandasWrapper, GenericCore):
     def copy(self):
         molecule = self.__class__(
             self._frame, metadata=self.metadata, _metadata=self._metadata)
+        molecule._struct_key = self._struct_key
         return molecule
 
+    def _copy_on_write(self):
+        """Return a copy that shares the frame until it is modified.
+
+        Only for internal use, if the frame of the copy is modified
+        right away. Views obtained from the frame of the copy
+        before would write into the frame of ``self``.
+        """
+        molecule = self.__class__(
+            self._frame, metadata=self.metadata, _metadata=self._metadata,
+            _assume_owned=True)
+        molecule._owned = False
+        molecule._struct_key = self._struct_key
+        return molecule
+
+    def _own_frame(self):
+        """Copy the frame, if it is shared with another instance.
+
+        Has to be called before ``self._frame`` is modified inplace.
+        """
+        if not self._owned:
+            self._frame = self._frame.copy()
+            self._owned = True
+
     def __getitem__(self, key):
         if isinstance(key, tuple):
             selected = self._frame[key[0], key[1]]
@@ -134,114 +168,108 @@ and assigning values safely.
         """
         return indexers._Safe_ILoc(self)
 
+    def _invalidate_struct_key(self):
+        """Has to be called, if the index or
+        the ``['atom', 'b', 'a', 'd']`` columns are modified.
+        """
+        self._struct_key = [None]
+
+    def _get_struct_key(self):
+        """Return a key for the index and the
+        ``['atom', 'b', 'a', 'd']`` columns.
+
+        The key is calculated lazily.
+        Copies share the same key (and the list holding it),
+        until the index or one of these columns is modified.
+        """
+        if self._struct_key[0] is None:
+            cols = ['atom', 'b', 'a', 'd']
+            self._struct_key[0] = (
+                tuple(self._frame.index),
+                tuple(map(tuple, self._frame.loc[:, cols].values)))
+        return self._struct_key[0]
+
     def _test_if_can_be_added(self, other):
+        if (self._struct_key is other._struct_key
+                or self._get_struct_key() == other._get_struct_key()):
+            return
         cols = ['atom', 'b', 'a', 'd']
-        if not (np.alltrue(self.loc[:, cols] == other.loc[:, cols])
-                and np.alltrue(self.index == other.index)):
+        if not (np.array_equal(self.index.values, other.index.values)
+                and np.array_equal(self._frame.loc[:, cols].values,
+                                   other._frame.loc[:, cols].values)):
             message = ("You can add only those zmatrices that have the same "
                        "index, use the same construction table, have the same "
                        "ordering... The only allowed difference is in the "
                        "columns ['bond', 'angle', 'dihedral']")
             raise PhysicalMeaning(message)
 
-    def __add__(self, other):
+    def _coord_block(self):
+        """Return the ``['bond', 'angle', 'dihedral']`` columns as array.
+        """
+        coords = ['bond', 'angle', 'dihedral']
+        return self._frame.loc[:, coords].to_numpy(copy=False)
+
+    def _get_coord_operand(self, other):
+        """Return the operand of a binary operation as array.
+
+        Pandas objects are aligned on the labels of ``self``.
+        """
         coords = ['bond', 'angle', 'dihedral']
         if isinstance(other, ZmatCore):
             self._test_if_can_be_added(other)
-            result = self.loc[:, coords] + other.loc[:, coords]
+            return other._coord_block()
+        elif isinstance(other, pd.DataFrame):
+            return other.reindex(index=self.index, columns=coords).to_numpy()
+        elif isinstance(other, pd.Series):
+            return other.reindex(coords).to_numpy()
         else:
-            result = self.loc[:, coords] + other
-        new = self.copy()
+            return other
+
+    def _with_coord_block(self, result):
+        """Return a copy with ``result`` assigned to
+        the ``['bond', 'angle', 'dihedral']`` columns.
+        """
+        coords = ['bond', 'angle', 'dihedral']
+        new = self._copy_on_write()
+        positions = new.columns.get_indexer(coords)
         if self.test_operators:
-            new.safe_loc[:, coords] = result
+            new.safe_iloc[:, positions] = result
         else:
-            new.unsafe_loc[:, coords] = result
+            new.unsafe_iloc[:, positions] = result
         return new
 
+    def __add__(self, other):
+        result = self._coord_block() + self._get_coord_operand(other)
+        return self._with_coord_block(result)
+
     def __radd__(self, other):
         return self + other
 
     def __sub__(self, other):
-        coords = ['bond', 'angle', 'dihedral']
-        if isinstance(other, ZmatCore):
-            self._test_if_can_be_added(other)
-            result = self.loc[:, coords] - other.loc[:, coords]
-        else:
-            result = self.loc[:, coords] - other
-        new = self.copy()
-        if self.test_operators:
-            new.safe_loc[:, coords] = result
-        else:
-            new.unsafe_loc[:, coords] = result
-        return new
+        result = self._coord_block() - self._get_coord_operand(other)
+        return self._with_coord_block(result)
 
     def __rsub__(self, other):
-        coords = ['bond', 'angle', 'dihedral']
-        if isinstance(other, ZmatCore):
-            self._test_if_can_be_added(other)
-            result = other.loc[:, coords] - self.loc[:, coords]
-        else:
-            result = other - self.loc[:, coords]
-        new = self.copy()
-        if self.test_operators:
-            new.safe_loc[:, coords] = result
-        else:
-            new.unsafe_loc[:, coords] = result
-        return new
+        result = self._get_coord_operand(other) - self._coord_block()
+        return self._with_coord_block(result)
 
     def __mul__(self, other):
-        coords = ['bond', 'angle', 'dihedral']
-        if isinstance(other, ZmatCore):
-            self._test_if_can_be_added(other)
-            result = self.loc[:, coords] * other.loc[:, coords]
-        else:
-            result = self.loc[:, coords] * other
-        new = self.copy()
-        if self.test_operators:
-            new.safe_loc[:, coords] = result
-        else:
-            new.unsafe_loc[:, coords] = result
-        return new
+        result = self._coord_block() * self._get_coord_operand(other)
+        return self._with_coord_block(result)
 
     def __rmul__(self, other):
         return self * other
 
     def __truediv__(self, other):
-        coords = ['bond', 'angle', 'dihedral']
-        if isinstance(other, ZmatCore):
-            self._test_if_can_be_added(other)
-            result = self.loc[:, coords] / other.loc[:, coords]
-        else:
-            result = self.loc[:, coords] / other
-        new = self.copy()
-        if self.test_operators:
-            new.safe_loc[:, coords] = result
-        else:
-            new.unsafe_loc[:, coords] = result
-        return new
+        result = self._coord_block() / self._get_coord_operand(other)
+        return self._with_coord_block(result)
 
     def __rtruediv__(self, other):
-        coords = ['bond', 'angle', 'dihedral']
-        if isinstance(other, ZmatCore):
-            self._test_if_can_be_added(other)
-            result = other.loc[:, coords] / self.loc[:, coords]
-        else:
-            result = other / self.loc[:, coords]
-        new = self.copy()
-        if self.test_operators:
-            new.safe_loc[:, coords] = result
-        else:
-            new.unsafe_loc[:, coords] = result
-        return new
+        result = self._get_coord_operand(other) / self._coord_block()
+        return self._with_coord_block(result)
 
     def __pow__(self, other):
-        coords = ['bond', 'angle', 'dihedral']
-        new = self.copy()
-        if self.test_operators:
-            new.safe_loc[:, coords] = self.loc[:, coords]**other
-        else:
-            new.unsafe_loc[:, coords] = self.loc[:, coords]**other
-        return new
+        return self._with_coord_block(self._coord_block()**other)
 
     def __pos__(self):
         return self.copy()
@@ -250,13 +278,7 @@ and assigning values safely.
         return -1 * self
 
     def __abs__(self):
-        coords = ['bond', 'angle', 'dihedral']
-        new = self.copy()
-        if self.test_operators:
-            new.safe_loc[:, coords] = abs(self.loc[:, coords])
-        else:
-            new.unsafe_loc[:, coords] = abs(self.loc[:, coords])
-        return new
+        return self._with_coord_block(abs(self._coord_block()))
 
     def __eq__(self, other):
         self._test_if_can_be_added(other)
@@ -268,12 +290,11 @@ and assigning values safely.
 
     @staticmethod
     def _cast_correct_types(frame):
-        new = frame.copy()
-        zmat_values = ['bond', 'angle', 'dihedral']
-        new.loc[:, zmat_values] = frame.loc[:, zmat_values].astype('f8')
-        zmat_cols = ['b', 'a', 'd']
-        new.loc[:, zmat_cols] = frame.loc[:, zmat_cols].astype('i8')
-        return new
+        dtypes = {col: 'f8' for col in ['bond', 'angle', 'dihedral']}
+        dtypes.update({col: 'i8' for col in ['b', 'a', 'd']})
+        return pd.DataFrame(
+            {col: frame[col].to_numpy(dtypes.get(col)) for col in frame},
+            index=frame.index)
 
     def iupacify(self):
         """Give the IUPAC conform representation.
@@ -388,6 +409,8 @@ and assigning values safely.
             If no :class:`~chemcoord.exceptions.InvalidReference`
             exceptions are raised, the resulting cartesian is written to
             ``self._metadata['last_valid_cartesian']``.
+            If none of the columns contains symbolic expressions,
+            a copy is returned without any checks.
 
         Args:
             symb_expr (sympy expression):
@@ -404,6 +427,9 @@ and assigning values safely.
         """
         perform_checks = kwargs.pop('perform_checks', True)
         cols = ['bond', 'angle', 'dihedral']
+        if not any(self._frame[col].dtype == np.dtype('O') for col in cols):
+            # There are no symbolic expressions to substitute.
+            return self.copy()
         out = self.copy()
 
         def get_subs_f(*args):
@@ -460,34 +486,39 @@ and assigning values safely.
         elif len(new_index) != len(self):
             raise ValueError('len(new_index) has to be the same as len(self)')
 
-        c_table = self.loc[:, ['b', 'a', 'd']]
-        # Strange bug in pandas where .replace is transitive for object columns
-        # and non-transitive for all other types.
-        # (Remember that string columns are just object columns)
-        # Example:
-        # A = {1: 2, 2: 3}
-        # Transtitive [1].replace(A) gives [3]
-        # Non-Transtitive [1].replace(A) gives [2]
-        # https://github.com/pandas-dev/pandas/issues/5338
-        # https://github.com/pandas-dev/pandas/issues/16051
-        # https://github.com/pandas-dev/pandas/issues/5541
-        # For this reason convert to int and replace then.
-
-        c_table = c_table.replace(constants.int_label)
-        try:
-            c_table = c_table.astype('i8')
-        except ValueError:
-            raise ValueError('Due to a bug in pandas it is necessary to have '
-                             'integer columns')
-        c_table = c_table.replace(self.index, new_index)
+        c_table = self.loc[:, ['b', 'a', 'd']].replace(constants.int_label)
+        c_table = pd.DataFrame(
+            self._relabel_references(c_table.values, new_index),
+            index=c_table.index, columns=c_table.columns)
         c_table = c_table.replace(
             {v: k for k, v in constants.int_label.items()})
 
         out = self.copy()
         out.unsafe_loc[:, ['b', 'a', 'd']] = c_table
+        out._own_frame()
         out._frame.index = new_index
+        out._invalidate_struct_key()
         return out
 
+    def _relabel_references(self, c_table, new_index):
+        """Replace the labels of ``self.index`` in the array ``c_table``
+        by the corresponding elements of ``new_index``.
+
+        All references are looked up at once in a hash table.
+        Absolute references and unknown labels stay unchanged.
+        """
+        # RangeIndex.get_indexer overflows for the integer labels
+        # of the absolute references, hence the conversion to a plain Index.
+        positions = pd.Index(self.index.values).get_indexer(c_table.ravel())
+        positions = positions.reshape(c_table.shape)
+        new_index = np.asarray(new_index)
+        if new_index.dtype.kind != 'i':
+            # Otherwise numpy promotes the integer labels of the
+            # absolute references to strings or floats.
+            c_table = c_table.astype('O')
+            new_index = new_index.astype('O')
+        return np.where(positions == -1, c_table, new_index[positions])
+
     def _insert_dummy_cart(self, exception, last_valid_cartesian=None):
         """Insert dummy atom into the already built cartesian of exception
         """
@@ -519,15 +550,14 @@ and assigning values safely.
     def _insert_dummy_zmat(self, exception, inplace=False):
         """Works INPLACE"""
         def insert_row(df, pos, key):
-            if pos < len(df):
-                middle = df.iloc[pos:(pos + 1)]
-                middle.index = [key]
-                start, end = df.iloc[:pos], df.iloc[pos:]
-                return pd.concat([start, middle, end])
-            elif pos == len(df):
-                start = df.copy()
-                start.loc[key] = start.iloc[-1]
-                return start
+            """Insert a duplicate of row ``pos`` (or of the last row)
+            with the label ``key`` before ``pos``.
+            Only one new frame is allocated and the dtypes are kept.
+            """
+            rows = np.insert(np.arange(len(df)), pos, min(pos, len(df) - 1))
+            new = df.iloc[rows]
+            new.index = df.index.insert(pos, key)
+            return new
 
         def raise_warning(i, dummy_d):
             give_message = ('For the dihedral reference of atom {i} the '
@@ -547,8 +577,11 @@ and assigning values safely.
             zframe.loc[dummy_d, ['bond', 'angle', 'dihedral']] = zmat_values
 
             zmat._frame = zframe
-            zmat._metadata['has_dummies'][i] = {'dummy_d': dummy_d,
-                                                'actual_d': actual_d}
+            zmat._owned = True
+            zmat._invalidate_struct_key()
+            has_dummies = dict(zmat._metadata['has_dummies'])
+            has_dummies[i] = {'dummy_d': dummy_d, 'actual_d': actual_d}
+            zmat._metadata['has_dummies'] = has_dummies
             raise_warning(i, dummy_d)
 
         zmat = self if inplace else self.copy()
@@ -569,14 +602,18 @@ and assigning values safely.
 
     def _has_removable_dummies(self):
         has_dummies = self._metadata['has_dummies']
-        to_be_tested = has_dummies.keys()
-        c_table = self.loc[to_be_tested, ['b', 'a', 'd']]
-        c_table['d'] = [has_dummies[i]['actual_d'] for i in to_be_tested]
+        to_be_tested = list(has_dummies.keys())
         xyz = self.get_cartesian().loc[:, ['x', 'y', 'z']]
-        BA = (xyz.loc[c_table['a']].values - xyz.loc[c_table['b']].values)
-        AD = (xyz.loc[c_table['d']].values - xyz.loc[c_table['a']].values)
-
-        remove = ~np.isclose(np.cross(BA, AD), np.zeros_like(BA)).all(axis=1)
+        xyz_arr = xyz.values
+        c_table = self.loc[to_be_tested, ['b', 'a']]
+        i_b = xyz.index.get_indexer(c_table['b'])
+        i_a = xyz.index.get_indexer(c_table['a'])
+        i_d = xyz.index.get_indexer(
+            [has_dummies[k]['actual_d'] for k in to_be_tested])
+        BA = xyz_arr[i_a] - xyz_arr[i_b]
+        AD = xyz_arr[i_d] - xyz_arr[i_a]
+
+        remove = np.linalg.norm(np.cross(BA, AD), axis=1) > 1e-8
         return [k for r, k in enumerate(to_be_tested) if remove[r]]
 
     def _remove_dummies(self, to_remove=None, inplace=False):
@@ -597,12 +634,14 @@ and assigning values safely.
 
         zmat_values = zmat.get_cartesian()._calculate_zmat_values(c_table)
         zmat.unsafe_loc[to_remove, ['bond', 'angle', 'dihedral']] = zmat_values
+        zmat._own_frame()
         zmat._frame.drop([has_dummies[k]['dummy_d'] for k in to_remove],
                          inplace=True)
+        zmat._invalidate_struct_key()
         warnings.warn('The dummy atoms {} were removed'.format(to_remove),
                       UserWarning)
-        for k in to_remove:
-            zmat._metadata['has_dummies'].pop(k)
+        zmat._metadata['has_dummies'] = {
+            k: v for k, v in has_dummies.items() if k not in to_remove}
         if not inplace:
             return zmat
 
@@ -615,39 +654,129 @@ and assigning values safely.
             zmat = zmat._insert_dummy_zmat(exception, inplace=False)
             return zmat._remove_dummies(inplace=False)
 
-    def get_cartesian(self):
+    def get_cartesian(self, dtype='f8'):
         """Return the molecule in cartesian coordinates.
 
         Raises an :class:`~exceptions.InvalidReference` exception,
         if the reference of the i-th atom is undefined.
 
         Args:
-            None
+            dtype: The floating point precision of the transformation
+                and the resulting coordinates.
+                Either double (``'f8'``) or single (``'f4'``) precision.
+                The kernels for single precision are compiled on first use.
 
         Returns:
             Cartesian: Reindexed version of the zmatrix.
         """
+        # Every row of C is contiguous, so the conversion to radians
+        # is done inplace without fancy indexing.
+        C = np.empty((3, len(self)), dtype=self._get_float_dtype(dtype))
+        for row, col in enumerate(['bond', 'angle', 'dihedral']):
+            C[row] = self._frame[col].values
+        np.radians(C[1:], out=C[1:])
+
+        err, row, positions = transformation.get_X(C, self._get_c_table())
+        return self._positions_to_cartesian(err, row, positions)
+
+    def get_cartesian_batch(self, zmat_values, max_workers=None,
+                            dtype='f8'):
+        """Return an ensemble of conformers in cartesian coordinates.
+
+        All conformers share the atoms and references of this zmatrix
+        and differ only in their bonds, angles, and dihedrals.
+        The transformation to cartesian coordinates is done
+        for all conformers at once.
+
+        Raises an :class:`~exceptions.InvalidReference` exception,
+        if the reference of the i-th atom of any conformer is undefined.
+        The exception refers to the first failing conformer
+        and carries the position of this conformer as ``conformer``.
+        ``already_built_conformers`` is the list of all cartesians
+        with None for the failing conformers.
+
+        Args:
+            zmat_values (np.ndarray): A ``(n_conformers, n_atoms, 3)`` array.
+                The last axis contains bond, angle, and dihedral
+                with the angles in degrees.
+                The atoms are ordered like the index of this zmatrix.
+            max_workers (int): If None, the conformers are distributed
+                by numba onto all cores in a single parallel kernel.
+                Otherwise they are dispatched to a thread pool
+                with ``max_workers`` threads; the kernel releases the GIL.
+            dtype: The floating point precision of the transformation
+                and the resulting coordinates.
+                Either double (``'f8'``) or single (``'f4'``) precision.
+                The kernels for single precision are compiled on first use.
+
+        Returns:
+            list: A list of :class:`~chemcoord.Cartesian`
+            with one entry per conformer.
+        """
+        zmat_values = np.asarray(zmat_values)
+        if zmat_values.shape[1:] != (len(self), 3):
+            message = ('zmat_values has to be of shape '
+                       '(n_conformers, {}, 3)'.format(len(self)))
+            raise ValueError(message)
+        c_table = self._get_c_table()
+        C = np.empty((len(zmat_values), 3, len(self)),
+                     dtype=self._get_float_dtype(dtype))
+        C[:] = np.moveaxis(zmat_values, 2, 1)
+        np.radians(C[:, 1:], out=C[:, 1:])
+
+        if max_workers is None:
+            results = zip(*transformation.get_X_batch(C, c_table))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(
+                    partial(transformation.get_X, c_table=c_table), C))
+
+        cartesians, first_exception = [], None
+        for m, (err, row, positions) in enumerate(results):
+            try:
+                cartesians.append(
+                    self._positions_to_cartesian(err, row, positions))
+            except InvalidReference as exception:
+                cartesians.append(None)
+                if first_exception is None:
+                    exception.conformer = m
+                    first_exception = exception
+        if first_exception is not None:
+            first_exception.already_built_conformers = cartesians
+            raise first_exception
+        return cartesians
+
+    @staticmethod
+    def _get_float_dtype(dtype):
+        """Return the dtype, if the transformation is compiled for it."""
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float64, np.float32):
+            raise ValueError('dtype has to be float64 or float32')
+        return dtype
+
+    def _get_c_table(self):
+        """Return the references as positions in a ``(3, n_atoms)`` array.
+        """
+        c_table = self.loc[:, ['b', 'a', 'd']]
+        c_table = c_table.replace(constants.int_label).values.T
+        if not self.index.equals(pd.RangeIndex(len(self))):
+            c_table = self._relabel_references(c_table, range(len(self)))
+        return np.ascontiguousarray(c_table, dtype='i8')
+
+    def _positions_to_cartesian(self, err, row, positions):
+        """Create a Cartesian from the output of the transformation."""
         def create_cartesian(positions, row):
-            xyz_frame = pd.DataFrame(columns=['atom', 'x', 'y', 'z'],
-                                     index=self.index[:row], dtype='f8')
-            xyz_frame['atom'] = self.loc[xyz_frame.index, 'atom']
-            xyz_frame.loc[:, ['x', 'y', 'z']] = positions[:row]
+            xyz_frame = pd.DataFrame({'atom': self._frame['atom'].values[:row],
+                                      'x': positions[:row, 0],
+                                      'y': positions[:row, 1],
+                                      'z': positions[:row, 2]},
+                                     index=self.index[:row])
             from chemcoord.cartesian_coordinates.cartesian_class_main \
                 import Cartesian
             cartesian = Cartesian(xyz_frame, metadata=self.metadata)
             return cartesian
 
-        c_table = self.loc[:, ['b', 'a', 'd']]
-        c_table = c_table.replace(constants.int_label)
-        c_table = c_table.replace({k: v for v, k in enumerate(c_table.index)})
-        c_table = c_table.values.astype('i8').T
-
-        C = self.loc[:, ['bond', 'angle', 'dihedral']].values.T
-        C[[1, 2], :] = np.radians(C[[1, 2], :])
-
-        err, row, positions = transformation.get_X(C, c_table)
         positions = positions.T
-
         if err == ERR_CODE_InvalidReference:
             rename = dict(enumerate(self.index))
             i = rename[row]
@@ -25,9 +25,11 @@ class ZmatIO(ZmatCore, GenericIO):
             message = "Give either 'latex', 'string' or 'raw' as format"
             raise ValueError(message)
         if format_as != 'raw':
+            out._own_frame()
             out._frame.replace(
                 to_replace={col: rename for col in ['b', 'a', 'd']},
                 inplace=True)
+            out._invalidate_struct_key()
         return out
 
     def _repr_html_(self):
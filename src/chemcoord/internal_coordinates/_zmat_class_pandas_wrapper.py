@@ -73,6 +73,9 @@ class PandasWrapper(object):
 
         Wrapper around the :meth:`pandas.DataFrame.sort_index` method.
         """
+        if inplace:
+            self._own_frame()
+            self._invalidate_struct_key()
         return self._frame.sort_index(axis=axis, level=level,
                                       ascending=ascending, inplace=inplace,
                                       kind=kind, na_position=na_position,
@@ -85,7 +88,9 @@ class PandasWrapper(object):
         Wrapper around the :meth:`pandas.DataFrame.insert` method.
         """
         out = self if inplace else self.copy()
+        out._own_frame()
         out._frame.insert(loc, column, value,
                           allow_duplicates=allow_duplicates)
+        out._invalidate_struct_key()
         if not inplace:
             return out
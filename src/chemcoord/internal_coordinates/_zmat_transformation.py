@@ -1,16 +1,20 @@
 # -*- coding: utf-8 -*-
 import numba as nb
 import numpy as np
-from numpy import sin, cos, cross
+from numpy import sin, cos, cross, sqrt
 from numpy.linalg import inv
-from numba import jit
+from numba import jit, prange
 
 import chemcoord.constants as constants
 from chemcoord.cartesian_coordinates.xyz_functions import _jit_isclose
 from chemcoord.cartesian_coordinates._cart_transformation import (
-    get_B, get_grad_B, get_ref_pos)
+    get_B, get_grad_B)
 from chemcoord.exceptions import ERR_CODE_OK, ERR_CODE_InvalidReference
 
+_E_X = constants.int_label['e_x']
+_E_Y = constants.int_label['e_y']
+_E_Z = constants.int_label['e_z']
+
 
 @jit(nopython=True, cache=True)
 def get_S(C, j):
@@ -49,16 +53,188 @@ def get_grad_S(C, j):
     return grad_S
 
 
-@jit(nopython=True, cache=True)
+@jit(nopython=True, cache=True, boundscheck=False)
+def get_S_all(C):
+    """Vectorized version of :func:`get_S` for all atoms.
+
+    The trigonometric functions and the tests for linear angles
+    are evaluated once for the whole array instead of per row.
+
+    Args:
+        C (np.ndarray): A ``(3, n_atoms)`` array.
+
+    Returns:
+        np.ndarray: A ``(3, n_atoms)`` array.
+    """
+    r, alpha, delta = C[0], C[1], C[2]
+    sin_alpha, cos_alpha = np.sin(alpha), np.cos(alpha)
+    sin_delta, cos_delta = np.sin(delta), np.cos(delta)
+    is_pi = _jit_isclose(alpha, np.pi)
+    is_zero = _jit_isclose(alpha, 0.)
+    is_linear = is_pi | is_zero
+
+    S = np.empty_like(C)
+    S[0] = np.where(is_linear, 0., r * sin_alpha * cos_delta)
+    S[1] = np.where(is_linear, 0., -r * sin_alpha * sin_delta)
+    S[2] = np.where(is_pi, r, np.where(is_zero, -r, -r * cos_alpha))
+    return S
+
+
+@jit(nopython=True, cache=True, boundscheck=False)
+def _get_ref_coords(X, i):
+    """Scalar version of :func:`get_ref_pos` for a single index.
+
+    The coordinates have the dtype of ``X``, so that
+    the single precision kernels are not promoted to double precision.
+    """
+    if i < constants.keys_below_are_abs_refs:
+        one, zero = X.dtype.type(1.), X.dtype.type(0.)
+        return (one if i == _E_X else zero, one if i == _E_Y else zero,
+                one if i == _E_Z else zero)
+    return (X[0, i], X[1, i], X[2, i])
+
+
+@jit(nopython=True, cache=True, fastmath=True, boundscheck=False,
+     error_model='numpy')
+def _place_atom(X, S, j, v_b, v_a, v_d):
+    """Write the position of the j-th atom into ``X[:, j]``.
+
+    This is the fused version of
+    ``get_B(X, c_table, j)[1] @ S[:, j] + get_ref_pos(X, c_table[0, j])``,
+    that applies the spherical coordinates directly onto the
+    basis vectors without building ``B``.
+    Everything is written out componentwise, so no temporary arrays
+    are allocated and the products can be fused.
+    The norms are nonzero after the tests for invalid references,
+    so the checks for division by zero are not required.
+
+    Args:
+        v_b, v_a, v_d (tuple): The positions of the references.
+
+    Returns:
+        int: An error code.
+    """
+    x_b, y_b, z_b = v_b
+    x_a, y_a, z_a = v_a
+    x_d, y_d, z_d = v_d
+
+    BA_x, BA_y, BA_z = x_a - x_b, y_a - y_b, z_a - z_b
+    if (_jit_isclose(BA_x, 0.) and _jit_isclose(BA_y, 0.)
+            and _jit_isclose(BA_z, 0.)):
+        return ERR_CODE_InvalidReference
+    AD_x, AD_y, AD_z = x_d - x_a, y_d - y_a, z_d - z_a
+
+    N_x = AD_y * BA_z - AD_z * BA_y
+    N_y = AD_z * BA_x - AD_x * BA_z
+    N_z = AD_x * BA_y - AD_y * BA_x
+    if (_jit_isclose(N_x, 0.) and _jit_isclose(N_y, 0.)
+            and _jit_isclose(N_z, 0.)):
+        return ERR_CODE_InvalidReference
+
+    norm_BA = sqrt(BA_x * BA_x + BA_y * BA_y + BA_z * BA_z)
+    e_z_x, e_z_y, e_z_z = -BA_x / norm_BA, -BA_y / norm_BA, -BA_z / norm_BA
+    norm_N = sqrt(N_x * N_x + N_y * N_y + N_z * N_z)
+    e_y_x, e_y_y, e_y_z = N_x / norm_N, N_y / norm_N, N_z / norm_N
+    e_x_x = e_y_y * e_z_z - e_y_z * e_z_y
+    e_x_y = e_y_z * e_z_x - e_y_x * e_z_z
+    e_x_z = e_y_x * e_z_y - e_y_y * e_z_x
+
+    S_x, S_y, S_z = S[0, j], S[1, j], S[2, j]
+    X[0, j] = x_b + S_x * e_x_x + S_y * e_y_x + S_z * e_z_x
+    X[1, j] = y_b + S_x * e_x_y + S_y * e_y_y + S_z * e_z_y
+    X[2, j] = z_b + S_x * e_x_z + S_y * e_y_z + S_z * e_z_z
+    return ERR_CODE_OK
+
+
+@jit(nopython=True, cache=True, boundscheck=False)
+def _calc_position(X, S, c_table, j):
+    """Write the position of the j-th atom into ``X[:, j]``.
+
+    The references may be absolute references.
+
+    Returns:
+        int: An error code.
+    """
+    return _place_atom(X, S, j,
+                       _get_ref_coords(X, c_table[0, j]),
+                       _get_ref_coords(X, c_table[1, j]),
+                       _get_ref_coords(X, c_table[2, j]))
+
+
+@jit(nopython=True, cache=True, boundscheck=False)
+def _calc_position_no_abs_refs(X, S, c_table, j):
+    """Write the position of the j-th atom into ``X[:, j]``.
+
+    Assumes that all references are other atoms.
+
+    Returns:
+        int: An error code.
+    """
+    b, a, d = c_table[0, j], c_table[1, j], c_table[2, j]
+    return _place_atom(X, S, j,
+                       (X[0, b], X[1, b], X[2, b]),
+                       (X[0, a], X[1, a], X[2, a]),
+                       (X[0, d], X[1, d], X[2, d]))
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, boundscheck=False)
+def _fill_X(X, C, c_table):
+    """Write the positions for the zmatrix values ``C`` into ``X``.
+
+    Returns:
+        tuple: The error code and the last calculated row.
+    """
+    S = get_S_all(C)
+    n_atoms = X.shape[1]
+    # Usually only the first three atoms use absolute references.
+    # The remaining atoms are then calculated without testing for them.
+    n_head = min(3, n_atoms)
+    if (c_table[:, n_head:] < constants.keys_below_are_abs_refs).any():
+        n_head = n_atoms
+    for j in range(n_head):
+        if _calc_position(X, S, c_table, j) == ERR_CODE_InvalidReference:
+            return (ERR_CODE_InvalidReference, j)
+    for j in range(n_head, n_atoms):
+        if (_calc_position_no_abs_refs(X, S, c_table, j)
+                == ERR_CODE_InvalidReference):
+            return (ERR_CODE_InvalidReference, j)
+    return (ERR_CODE_OK, n_atoms - 1)
+
+
+@jit(nopython=True, nogil=True, cache=True)
 def get_X(C, c_table):
+    # get_grad_X passes arbitrary views, but the kernels
+    # are only compiled for C-contiguous arrays.
+    C = np.ascontiguousarray(C)
     X = np.empty_like(C)
-    n_atoms = X.shape[1]
-    for j in range(n_atoms):
-        err, B = get_B(X, c_table, j)
-        if err == ERR_CODE_InvalidReference:
-            return (err, j, X)
-        X[:, j] = B @ get_S(C, j) + get_ref_pos(X, c_table[0, j])
-    return (ERR_CODE_OK, j, X)  # pylint:disable=undefined-loop-variable
+    err, row = _fill_X(X, C, np.ascontiguousarray(c_table))
+    return (err, row, X)
+
+
+@jit(nopython=True, cache=True, parallel=True, boundscheck=False)
+def get_X_batch(C, c_table):
+    """Transform an ensemble of conformers to cartesian coordinates.
+
+    All conformers have to share the same construction table.
+    The conformers are processed in parallel.
+
+    Args:
+        C (np.ndarray): A ``(n_conformers, 3, n_atoms)`` array
+            of double or single precision.
+        c_table (np.ndarray): A ``(3, n_atoms)`` array.
+
+    Returns:
+        tuple: The error codes and the last calculated rows
+        with shape ``(n_conformers,)`` and
+        the positions with shape ``(n_conformers, 3, n_atoms)``.
+    """
+    n_conformers = C.shape[0]
+    X = np.empty_like(C)
+    err = np.empty(n_conformers, dtype=np.int64)
+    rows = np.empty(n_conformers, dtype=np.int64)
+    for m in prange(n_conformers):
+        err[m], rows[m] = _fill_X(X[m], C[m], c_table)
+    return err, rows, X
 
 
 @jit(nopython=True, cache=True)
@@ -34,3 +34,17 @@ def test_multiple_subs():
     symb_zwater.subs(a, 180)
     symb_zwater.safe_loc[6, 'dihedral'] = c
     symb_zwater.subs(a, 180.)
+
+
+def test_subs_without_symbols(monkeypatch):
+    path = os.path.join(STRUCTURE_PATH, 'water.xyz')
+    zwater = cc.Cartesian.read_xyz(path, start_index=1).get_zmat()
+
+    def get_cartesian(self):
+        raise AssertionError('get_cartesian must not be called')
+    monkeypatch.setattr(cc.Zmat, 'get_cartesian', get_cartesian)
+
+    a = sympy.symbols('a')
+    substituted = zwater.subs(a, 180)
+    assert substituted is not zwater
+    assert substituted._frame.equals(zwater._frame)
@@ -2,9 +2,12 @@ import os
 from os.path import join
 from io import StringIO
 from sympy import Symbol
+import numpy as np
 import pytest
 
 import chemcoord as cc
+import chemcoord.constants as constants
+import chemcoord.internal_coordinates._zmat_transformation as transformation
 from chemcoord.xyz_functions import allclose
 
 
@@ -49,7 +52,10 @@ def test_write_and_read():
     water_1 = cc.Cartesian.read_xyz(
         join(STRUCTURE_PATH, 'water.xyz'), start_index=1)
     z_water_str = water_1.get_zmat().to_zmat(upper_triangle=True)
-    water_2 = cc.Zmat.read_zmat(StringIO(z_water_str)).get_cartesian()
+    z_water = cc.Zmat.read_zmat(StringIO(z_water_str))
+    assert (z_water.loc[:, ['bond', 'angle', 'dihedral']].dtypes
+            == np.float64).all()
+    water_2 = z_water.get_cartesian()
     assert allclose(water_1, water_2, atol=1e-6)
 
     z_water_str = water_1.get_zmat().to_zmat(upper_triangle=False)
@@ -71,3 +77,123 @@ def test_pure_internal_move():
     for m in structures:
         assert cc.xyz_functions.allclose(m, ref.align(m, mass_weight=True)[1])
 
+
+def test_get_X_batch():
+    zm = cc.Cartesian.read_xyz(
+        join(STRUCTURE_PATH, 'MIL53_small.xyz'), start_index=1).get_zmat()
+    c_table = zm.loc[:, ['b', 'a', 'd']].replace(constants.int_label)
+    c_table = c_table.replace({k: v for v, k in enumerate(c_table.index)})
+    c_table = np.ascontiguousarray(c_table.values.astype('i8').T)
+    C = zm.loc[:, ['bond', 'angle', 'dihedral']].values.T.astype('f8')
+    C[[1, 2], :] = np.radians(C[[1, 2], :])
+
+    C_batch = np.stack([C, C * 1.05])
+    C_batch[1, 1, 3] = 0.
+    err, rows, X = transformation.get_X_batch(C_batch, c_table)
+    for m in range(len(C_batch)):
+        expected_err, expected_row, expected_X = transformation.get_X(
+            C_batch[m], c_table)
+        assert err[m] == expected_err and rows[m] == expected_row
+        assert np.allclose(X[m, :, :rows[m] + 1],
+                           expected_X[:, :expected_row + 1])
+
+
+def test_get_cartesian_batch():
+    zm = cc.Cartesian.read_xyz(
+        join(STRUCTURE_PATH, 'MIL53_small.xyz'), start_index=1).get_zmat()
+    zmat_values = zm.loc[:, ['bond', 'angle', 'dihedral']].values
+    zmat_values = np.stack([zmat_values, zmat_values * 1.05]).astype('f8')
+    zmats = [zm.copy(), zm.copy()]
+    zmats[1].unsafe_loc[:, ['bond', 'angle', 'dihedral']] = zmat_values[1]
+    for max_workers in [None, 2]:
+        batch = zm.get_cartesian_batch(zmat_values, max_workers=max_workers)
+        for molecule, zmat in zip(batch, zmats):
+            assert allclose(molecule, zmat.get_cartesian())
+
+    zmat_values[1, 2, 1] = 180.
+    with pytest.raises(cc.exceptions.InvalidReference) as exception_info:
+        zm.get_cartesian_batch(zmat_values)
+    exception = exception_info.value
+    assert exception.conformer == 1
+    assert 'conformer 1' in str(exception)
+    assert allclose(exception.already_built_conformers[0], batch[0])
+    assert exception.already_built_conformers[1] is None
+
+
+def test_get_cartesian_single_precision():
+    zm = cc.Cartesian.read_xyz(
+        join(STRUCTURE_PATH, 'MIL53_small.xyz'), start_index=1).get_zmat()
+    molecule = zm.get_cartesian(dtype='f4')
+    assert (molecule.loc[:, ['x', 'y', 'z']].dtypes == np.float32).all()
+    assert allclose(molecule, zm.get_cartesian(), atol=1e-4)
+
+    zmat_values = zm.loc[:, ['bond', 'angle', 'dihedral']].values[None]
+    batch = zm.get_cartesian_batch(zmat_values.astype('f8'), dtype='f4')
+    assert allclose(batch[0], molecule)
+    with pytest.raises(ValueError):
+        zm.get_cartesian(dtype='f2')
+
+
+def test_addition_after_changing_references():
+    zm = cc.Cartesian.read_xyz(
+        join(STRUCTURE_PATH, 'MIL53_small.xyz'), start_index=1).get_zmat()
+    zm2 = zm.copy()
+    zm + zm2
+    assert zm._struct_key is zm2._struct_key
+
+    zm2.unsafe_loc[:, 'bond'] = zm2.loc[:, 'bond'] * 1.01
+    assert zm._struct_key is zm2._struct_key
+    zm + zm2
+
+    i = zm2.index[5]
+    zm2.unsafe_loc[i, 'a'] = zm2.loc[i, 'd']
+    assert zm._struct_key is not zm2._struct_key
+    with pytest.raises(cc.exceptions.PhysicalMeaning):
+        zm + zm2
+
+
+def test_copy_on_write():
+    zm = cc.Cartesian.read_xyz(
+        join(STRUCTURE_PATH, 'MIL53_small.xyz'), start_index=1).get_zmat()
+    bond = zm.loc[:, 'bond'].copy()
+    zm2 = zm.copy()
+    zm2.loc[:, 'bond'].values[0] = 123.
+    zm2['bond'].iloc[1] = 123.
+    assert np.allclose(zm.loc[:, 'bond'], bond)
+
+    zm2.unsafe_loc[:, 'bond'] = 0.
+    assert np.allclose(zm.loc[:, 'bond'], bond)
+    zm3 = zm.copy()
+    zm.unsafe_loc[:, 'bond'] = 1.
+    assert np.allclose(zm3.loc[:, 'bond'], bond)
+    assert np.allclose(zm2.loc[:, 'bond'], 0.)
+
+    zm4 = zm3 * 1.01
+    assert np.allclose(zm3.loc[:, 'bond'], bond)
+    assert np.allclose(zm4.loc[:, 'bond'], bond * 1.01)
+    zm4.loc[:, 'bond'].values[0] = 123.
+    assert np.allclose(zm3.loc[:, 'bond'], bond)
+
+
+def test_change_numbering():
+    molecule = cc.Cartesian.read_xyz(
+        join(STRUCTURE_PATH, 'MIL53_small.xyz'), start_index=1)
+    zm = molecule.get_zmat()
+    shifted = zm.change_numbering(new_index=zm.index + 1)
+    assert (shifted.index == zm.index + 1).all()
+    references = zm.loc[zm.index[3:], ['b', 'a', 'd']].values.astype('i8')
+    assert (shifted.loc[shifted.index[3:], ['b', 'a', 'd']].values
+            == references + 1).all()
+    assert shifted.loc[shifted.index[0], 'b'] == 'origin'
+    assert np.allclose(shifted.get_cartesian().loc[:, ['x', 'y', 'z']],
+                       zm.get_cartesian().loc[:, ['x', 'y', 'z']])
+
+    new_index = ['a{}'.format(i) for i in range(len(zm))]
+    renamed = zm.change_numbering(new_index=new_index)
+    assert list(renamed.index) == new_index
+    assert (renamed.loc[:, ['b', 'a', 'd']].values
+            == zm.loc[:, ['b', 'a', 'd']].replace(
+                dict(zip(zm.index, new_index))).values).all()
+    assert list(renamed.loc[renamed.index[0], ['b', 'a', 'd']]) == [
+        'origin', 'e_z', 'e_x']
+    assert renamed.loc[renamed.index[2], 'd'] == 'e_x'